@@ -26,6 +26,11 @@ STABLE_PATH = os.getenv("STABLE_PATH", os.path.join(DATA_DIR, "today.jpg"))
 USE_SYMLINK = os.getenv("USE_SYMLINK", "false").lower() == "true"
 RETAIN_DAYS = int(os.getenv("RETAIN_DAYS", "14"))
 
+# Fingerprints of processed images (skip OCR/rebuild for reposts)
+FINGERPRINT_INDEX_PATH = os.getenv("FINGERPRINT_INDEX_PATH", os.path.join(DATA_DIR, "image_fingerprints.json"))
+# Re-encodes measure <= ~4, a single changed digit >= ~7 (see test/test_fingerprint.py)
+FINGERPRINT_MAX_DIFF = float(os.getenv("FINGERPRINT_MAX_DIFF", "5"))
+
 # Timezone
 UZ_TZ = pytz_tz("Asia/Tashkent")
 
@@ -1,18 +1,29 @@
 # --- notifier.py ---
-from datetime import datetime
+import os
+import json
+from datetime import datetime, timedelta
 from pytz import timezone
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from telegram import Bot
 
-from utils import extract_text_from_image, extract_prayer_times, PRAYER_NAME_MAP
-from config import BOT_TOKEN, CHAT_ID, UZ_TZ
+from utils import (
+    extract_text_from_image, extract_prayer_times, PRAYER_NAME_MAP,
+    image_fingerprint, fingerprint_distance,
+)
+from config import (
+    BOT_TOKEN, CHAT_ID, UZ_TZ,
+    FINGERPRINT_INDEX_PATH, FINGERPRINT_MAX_DIFF, RETAIN_DAYS,
+)
 
 bot = Bot(token=BOT_TOKEN)
 scheduler = BackgroundScheduler(timezone=UZ_TZ)
 
 ORDER = ["ТОНГ", "ҚУЁШ", "ПЕШИН", "АСр", "АСР", "ШОМ", "ХУФТОН"]  # tolerate a stray lowercase variant
 
+# What this process currently has jobs for: {"date": "YYYY-MM-DD", "times": {...}}
+_scheduled: dict = {"date": None, "times": None}
+
 def _send(name_cyr: str):
     eng = PRAYER_NAME_MAP.get(name_cyr, name_cyr)
     if eng == 'Sunrise':
@@ -36,6 +47,60 @@ def _send_daily_summary(times: dict):
     bot.send_message(chat_id=CHAT_ID, text=text)
     print("✅ Sent daily summary.")
 
+def _send_times_update(changes: list[tuple[str, str | None, str | None]]):
+    lines = ["🔄 Today's times were updated (UZT):"]
+    for key, old, new in changes:
+        lines.append(f"• {PRAYER_NAME_MAP.get(key, key)} — {old or '—'} → {new or '—'}")
+    bot.send_message(chat_id=CHAT_ID, text="\n".join(lines))
+    print("✅ Sent times update.")
+
+def _diff_times(old: dict, new: dict) -> list[tuple[str, str | None, str | None]]:
+    """Return [(name, old_hhmm, new_hhmm), ...] for every prayer whose time moved."""
+    keys = [k for k in ORDER if k in old or k in new]
+    keys += [k for k in {**old, **new} if k not in ORDER]
+    return [(k, old.get(k), new.get(k)) for k in keys if old.get(k) != new.get(k)]
+
+# ----------------- image fingerprint index -----------------
+def _load_fingerprint_index() -> dict:
+    """
+    {"YYYY-MM-DD": {"images": [{"fingerprint": "...", "times": {...}}],
+                    "current": {...} | None,   # times the schedule was last built from
+                    "summary_sent": bool}}
+    """
+    try:
+        with open(FINGERPRINT_INDEX_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print("⚠️ Could not read fingerprint index, starting fresh:", e)
+        return {}
+
+def _save_fingerprint_index(index: dict):
+    if RETAIN_DAYS > 0:
+        cutoff = (datetime.now(UZ_TZ) - timedelta(days=RETAIN_DAYS)).date().isoformat()
+        index = {d: v for d, v in index.items() if d >= cutoff}
+    tmp = FINGERPRINT_INDEX_PATH + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, FINGERPRINT_INDEX_PATH)
+    except Exception as e:
+        print("⚠️ Could not write fingerprint index:", e)
+
+def _find_similar(entries: list, fingerprint: str) -> dict | None:
+    best, best_dist = None, None
+    for entry in entries:
+        try:
+            dist = fingerprint_distance(entry["fingerprint"], fingerprint)
+        except (KeyError, ValueError):
+            continue
+        if dist <= FINGERPRINT_MAX_DIFF and (best_dist is None or dist < best_dist):
+            best, best_dist = entry, dist
+    if best is not None:
+        print(f"🧬 Image matches an already-processed one (diff {best_dist:.2f}).")
+    return best
+
 def _clear_old_jobs():
     for job in scheduler.get_jobs():
         if job.name and (job.name.startswith("prayer-") or job.name.startswith("daily-summary-")):
@@ -44,24 +109,57 @@ def _clear_old_jobs():
 def schedule_from_image(image_path: str, summary_mode: str = "immediate"):
     """
     Parse prayer times from `image_path` and schedule today's notifications.
-    - Clears previous prayer/summary jobs.
+    - Images matching the fingerprint of one already processed today (reposts,
+      re-encoded copies) reuse its parsed times instead of running OCR again.
+    - If the times equal what is already scheduled, nothing is rebuilt or re-sent;
+      otherwise clears previous prayer/summary jobs.
     - Schedules only FUTURE notifications for the current day.
     - Sends a daily summary immediately (default) or schedules it for 00:30.
+      If today's summary was already sent, only the moved times are sent.
       summary_mode: "immediate" | "0030"
     """
-    _clear_old_jobs()
+    now = datetime.now(UZ_TZ)
+    today = now.date()
 
-    txt = extract_text_from_image(image_path)
-    times = extract_prayer_times(txt)
-    print("📅 Extracted times:", times)
+    index = _load_fingerprint_index()
+    day = index.setdefault(today.isoformat(), {"images": [], "summary_sent": False})
+
+    try:
+        fingerprint = image_fingerprint(image_path)
+    except Exception as e:
+        print("⚠️ Could not fingerprint image:", e)
+        fingerprint = None
+
+    match = _find_similar(day["images"], fingerprint) if fingerprint else None
+    if match is not None:
+        times = match["times"]
+        print("♻️ Reusing parsed times:", times)
+    else:
+        txt = extract_text_from_image(image_path)
+        times = extract_prayer_times(txt)
+        print("📅 Extracted times:", times)
 
     # Require a reasonable set
     if len(times) < 4:
         print("⚠️ Not enough times parsed; skipping scheduling.")
         return
 
-    now = datetime.now(UZ_TZ)
-    today = now.date()
+    if match is None and fingerprint:
+        day["images"].append({"fingerprint": fingerprint, "times": times})
+
+    # Only a real content change rebuilds jobs that are already in place
+    if _scheduled == {"date": today.isoformat(), "times": times}:
+        print("⏭️ Same timetable already scheduled; skipping rebuild.")
+        _save_fingerprint_index(index)
+        return
+
+    prev_times = day.get("current")
+    changes = _diff_times(prev_times, times) if prev_times else []
+    if changes:
+        print("🔀 Times moved:", ", ".join(f"{k} {o}→{n}" for k, o, n in changes))
+    day["current"] = times
+
+    _clear_old_jobs()
 
     # Schedule each prayer (future only)
     for name_cyr, hhmm in times.items():
@@ -84,9 +182,17 @@ def schedule_from_image(image_path: str, summary_mode: str = "immediate"):
             )
             print(f"⏰ Scheduled {name_cyr} at {hh:02d}:{mm:02d}")
 
+    _scheduled.update(date=today.isoformat(), times=times)
+
     # Daily summary
     if summary_mode == "immediate":
-        _send_daily_summary(times)
+        if not day["summary_sent"]:
+            _send_daily_summary(times)
+            day["summary_sent"] = True
+        elif changes:
+            _send_times_update(changes)
+        else:
+            print("ℹ️ Daily summary already sent today; skipping.")
     else:
         # schedule a 00:30 summary
         trigger = CronTrigger(hour=0, minute=30, timezone=UZ_TZ)
@@ -106,4 +212,6 @@ def schedule_from_image(image_path: str, summary_mode: str = "immediate"):
             misfire_grace_time=300,
             coalesce=True,
         )
-        print("🗓️ Daily summary scheduled for 00:30 UZT.")
\ No newline at end of file
+        print("🗓️ Daily summary scheduled for 00:30 UZT.")
+
+    _save_fingerprint_index(index)
\ No newline at end of file
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# config.py/notifier.py read these at import time
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="imonuz-test-"))
+os.environ.setdefault("BOT_TOKEN", "123456:TEST-TOKEN")
+os.environ.setdefault("CHAT_ID", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,185 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import notifier
+from utils import image_fingerprint, fingerprint_distance
+from config import FINGERPRINT_MAX_DIFF
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prayer_times.jpg")
+
+# Glyph boxes in prayer_times.jpg: last minute digit of "04:25" (ТОНГ) and of "17:03" (АСР)
+TONG_MIN2 = (slice(123, 153), slice(372, 389))
+ASR_MIN2 = (slice(297, 327), slice(372, 389))
+
+A_TIMES = {"ТОНГ": "04:25", "ҚУЁШ": "05:48", "ПЕШИН": "12:23", "АСР": "17:03", "ШОМ": "19:01", "ХУФТОН": "20:21"}
+B_TIMES = {**A_TIMES, "ТОНГ": "04:23"}
+
+
+def _save(img: Image.Image, path, quality=95) -> str:
+    img.save(path, "JPEG", quality=quality)
+    return str(path)
+
+
+def _one_digit_changed() -> Image.Image:
+    """The sample with ТОНГ 04:25 -> 04:23 (the "3" glyph copied from 17:03)."""
+    px = np.asarray(Image.open(SAMPLE).convert("RGB")).copy()
+    px[TONG_MIN2] = px[ASR_MIN2]
+    return Image.fromarray(px)
+
+
+@pytest.fixture
+def images(tmp_path):
+    original = Image.open(SAMPLE).convert("RGB")
+    changed = _one_digit_changed()
+    return {
+        "A": _save(original, tmp_path / "a.jpg"),
+        "A_repost": _save(original, tmp_path / "a_repost.jpg", quality=50),
+        "B": _save(changed, tmp_path / "b.jpg"),
+        "B_repost": _save(changed, tmp_path / "b_repost.jpg", quality=50),
+        "A_resized": _save(original.resize((360, 418), Image.LANCZOS), tmp_path / "a_resized.jpg"),
+    }
+
+
+# ----------------- fingerprint threshold -----------------
+@pytest.mark.parametrize("quality", [30, 50, 85])
+def test_reencoded_copy_matches(tmp_path, quality):
+    original = Image.open(SAMPLE).convert("RGB")
+    copy = _save(original, tmp_path / "copy.jpg", quality=quality)
+    assert fingerprint_distance(image_fingerprint(SAMPLE), image_fingerprint(copy)) <= FINGERPRINT_MAX_DIFF
+
+
+def test_identical_file_distance_is_zero():
+    fp = image_fingerprint(SAMPLE)
+    assert fingerprint_distance(fp, fp) == 0
+
+
+@pytest.mark.parametrize("quality", [95, 50])
+def test_one_digit_change_does_not_match(tmp_path, quality):
+    changed = _save(_one_digit_changed(), tmp_path / "changed.jpg", quality=quality)
+    assert fingerprint_distance(image_fingerprint(SAMPLE), image_fingerprint(changed)) > FINGERPRINT_MAX_DIFF
+
+
+# ----------------- _diff_times -----------------
+def test_diff_times_follows_day_order():
+    old = {"ХУФТОН": "20:21", "ТОНГ": "04:25", "АСР": "17:03"}
+    new = {"ХУФТОН": "20:20", "ТОНГ": "04:23", "АСР": "17:03"}
+    assert notifier._diff_times(old, new) == [("ТОНГ", "04:25", "04:23"), ("ХУФТОН", "20:21", "20:20")]
+
+
+def test_diff_times_reports_missing_keys():
+    old = {"ТОНГ": "04:25", "ШОМ": "19:01"}
+    new = {"ТОНГ": "04:25", "ПЕШИН": "12:23"}
+    assert notifier._diff_times(old, new) == [("ПЕШИН", None, "12:23"), ("ШОМ", "19:01", None)]
+
+
+def test_diff_times_identical_is_empty():
+    assert notifier._diff_times(A_TIMES, dict(A_TIMES)) == []
+
+
+# ----------------- schedule_from_image -----------------
+class _FakeJob:
+    def __init__(self, job_id, name):
+        self.id = job_id
+        self.name = name
+
+
+class _FakeScheduler:
+    def __init__(self):
+        self.jobs = {}
+
+    def get_jobs(self):
+        return list(self.jobs.values())
+
+    def remove_job(self, job_id):
+        self.jobs.pop(job_id)
+
+    def add_job(self, func, *args, name=None, id=None, **kwargs):
+        job_id = id or f"job-{len(self.jobs)}-{name}"
+        self.jobs[job_id] = _FakeJob(job_id, name)
+
+
+class _FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        self.sent.append(text)
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path, images):
+    bot, sched, ocr_calls = _FakeBot(), _FakeScheduler(), []
+    ocr = {images["A"]: A_TIMES, images["B"]: B_TIMES, images["A_repost"]: A_TIMES, images["B_repost"]: B_TIMES,
+           images["A_resized"]: A_TIMES}
+
+    def fake_ocr(path):
+        ocr_calls.append(path)
+        return path
+
+    monkeypatch.setattr(notifier, "bot", bot)
+    monkeypatch.setattr(notifier, "scheduler", sched)
+    monkeypatch.setattr(notifier, "extract_text_from_image", fake_ocr)
+    monkeypatch.setattr(notifier, "extract_prayer_times", lambda txt: dict(ocr[txt]))
+    monkeypatch.setattr(notifier, "FINGERPRINT_INDEX_PATH", str(tmp_path / "index.json"))
+    monkeypatch.setattr(notifier, "_scheduled", {"date": None, "times": None})
+    return bot, ocr_calls
+
+
+def test_repost_sequence_sends_summary_then_diffs(env, images):
+    bot, ocr_calls = env
+
+    notifier.schedule_from_image(images["A"])
+    assert len(bot.sent) == 1 and bot.sent[0].startswith("📅")
+
+    notifier.schedule_from_image(images["B"])
+    assert len(bot.sent) == 2
+    assert "Fajr — 04:25 → 04:23" in bot.sent[1]
+
+    notifier.schedule_from_image(images["A_repost"])
+    assert len(bot.sent) == 3
+    assert "Fajr — 04:23 → 04:25" in bot.sent[2]
+
+    notifier.schedule_from_image(images["B_repost"])
+    assert len(bot.sent) == 4
+    assert "Fajr — 04:25 → 04:23" in bot.sent[3]
+
+    # Reposts reuse the stored times instead of running OCR again
+    assert ocr_calls == [images["A"], images["B"]]
+
+
+def test_repost_of_scheduled_image_is_skipped(env, images):
+    bot, ocr_calls = env
+
+    notifier.schedule_from_image(images["A"])
+    notifier.schedule_from_image(images["A"])
+    notifier.schedule_from_image(images["A_repost"])
+
+    assert len(bot.sent) == 1
+    assert ocr_calls == [images["A"]]
+
+
+def test_restart_rebuilds_without_resending_summary(env, images, monkeypatch):
+    bot, ocr_calls = env
+
+    notifier.schedule_from_image(images["A"])
+    # New process: jobs are gone, the index on disk remains
+    monkeypatch.setattr(notifier, "_scheduled", {"date": None, "times": None})
+    notifier.schedule_from_image(images["A_repost"])
+
+    assert len(bot.sent) == 1
+    assert notifier._scheduled["times"] == A_TIMES
+    assert ocr_calls == [images["A"]]
+
+
+def test_unmatched_copy_with_same_times_is_skipped(env, images):
+    bot, ocr_calls = env
+
+    notifier.schedule_from_image(images["A"])
+    # Too different to match the fingerprint, so OCR decides: same times, no rebuild
+    notifier.schedule_from_image(images["A_resized"])
+
+    assert len(bot.sent) == 1
+    assert ocr_calls == [images["A"], images["A_resized"]]
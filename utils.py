@@ -1,9 +1,11 @@
 # --- utils.py ---
 import os
 import re
+import base64
 import difflib
 from datetime import time as dtime
 from PIL import Image
+import numpy as np
 import pytesseract
 
 # Let pytesseract auto-find tesseract (Docker) or allow override via env.
@@ -55,6 +57,30 @@ def extract_text_from_image(image_path: str) -> str:
             continue
     return pytesseract.image_to_string(img)  # last resort
 
+FINGERPRINT_SIZE = (96, 112)  # grayscale thumbnail (w, h) the fingerprint is taken at
+FINGERPRINT_BLOCK = 4         # compared in 4x4 blocks, roughly a quarter of a digit
+
+def image_fingerprint(image_path: str) -> str:
+    """
+    Downscaled grayscale thumbnail of the image (base64), used to spot reposts.
+    Unlike a whole-image hash it keeps enough detail for one changed digit to show up.
+    """
+    with Image.open(image_path) as img:
+        gray = img.convert("L").resize(FINGERPRINT_SIZE, Image.BOX)
+    return base64.b64encode(np.asarray(gray, dtype=np.uint8).tobytes()).decode("ascii")
+
+def fingerprint_distance(a: str, b: str) -> float:
+    """
+    Largest mean absolute difference over any block of the two thumbnails (0-255).
+    JPEG re-encodes stay low everywhere; an edited digit is a large local change.
+    """
+    w, h = FINGERPRINT_SIZE
+    bs = FINGERPRINT_BLOCK
+    pa = np.frombuffer(base64.b64decode(a), dtype=np.uint8).reshape(h, w).astype(np.float32)
+    pb = np.frombuffer(base64.b64decode(b), dtype=np.uint8).reshape(h, w).astype(np.float32)
+    blocks = np.abs(pa - pb).reshape(h // bs, bs, w // bs, bs).mean(axis=(1, 3))
+    return float(blocks.max())
+
 def _hhmm_to_time(hhmm: str) -> dtime | None:
     try:
         h, m = map(int, hhmm.split(":"))